@@ -1,27 +1,101 @@
 import getpass
 import logging
-import yaml
 import argparse
+import hashlib
 from pathlib import Path
 from nornir import InitNornir
+from nornir_utils.plugins.functions import print_result
 from utils.csv_handler import write_to_csv
+from utils.results import HostResult
+from utils.yaml_fast import safe_dump
+from utils.throttle import ConnectThrottle
+from utils.resolver import AddressPrefetcher
 from tasks.nxos_tasks import check_port_profiles
 
+LOG_BUFFER_SIZE = 1 << 16
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that lets the file buffer records instead of flushing each one
+
+    Records at ERROR and above are flushed immediately; everything else is
+    written when the buffer fills, on an explicit flush() or when logging
+    shuts down at exit.
+    """
+
+    def __init__(self, filename, buffer_size=LOG_BUFFER_SIZE, **kwargs):
+        self.buffer_size = buffer_size
+        self._defer_flush = False
+        super().__init__(filename, **kwargs)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record):
+        # StreamHandler.emit flushes after every record; skip that below ERROR
+        self._defer_flush = record.levelno < logging.ERROR
+        try:
+            super().emit(record)
+        finally:
+            self._defer_flush = False
+
+    def flush(self):
+        if not self._defer_flush:
+            super().flush()
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('logs/nxos_checker.log'),
+        BufferedFileHandler('logs/nxos_checker.log'),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
 
+MAX_DEFAULT_WORKERS = 50
+
+def positive_int(value):
+    """argparse type for integers greater than zero"""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def non_negative_float(value):
+    """argparse type for floats that are zero or greater"""
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {value}")
+    return number
+
+INVENTORY_DIR = Path('src/inventory')
+INVENTORY_FILES = ('hosts.yaml', 'groups.yaml', 'defaults.yaml')
+
+# Holds the SHA-256 of the hostnames file the inventory was generated from
+INVENTORY_STAMP = INVENTORY_DIR / '.hostnames.sha256'
+
+def inventory_is_current(digest):
+    """Check that the inventory files exist and were generated from a file with this digest"""
+    try:
+        if not all((INVENTORY_DIR / name).exists() for name in INVENTORY_FILES):
+            return False
+        return INVENTORY_STAMP.read_text().strip() == digest
+    except OSError:
+        return False
+
 def create_inventory_files_from_txt(txt_file):
     """Create YAML inventory files from text file"""
-    with open(txt_file, 'r') as f:
-        hostnames = [line.strip() for line in f if line.strip()]
+    txt_bytes = Path(txt_file).read_bytes()
+    hostnames = [line.strip() for line in txt_bytes.decode().splitlines() if line.strip()]
+    
+    # Skip regeneration if the inventory was built from identical hostnames
+    digest = hashlib.sha256(txt_bytes).hexdigest()
+    if inventory_is_current(digest):
+        logger.debug("Inventory files are up to date, skipping regeneration")
+        return len(hostnames)
     
     # Create hosts.yaml
     hosts = {}
@@ -48,17 +122,19 @@ def create_inventory_files_from_txt(txt_file):
     defaults = {'platform': 'nxos'}
     
     # Write YAML files
-    inventory_dir = Path('src/inventory')
-    inventory_dir.mkdir(exist_ok=True)
+    INVENTORY_DIR.mkdir(exist_ok=True)
     
-    with open(inventory_dir / 'hosts.yaml', 'w') as f:
-        yaml.dump(hosts, f, default_flow_style=False)
+    with open(INVENTORY_DIR / 'hosts.yaml', 'w') as f:
+        safe_dump(hosts, f)
     
-    with open(inventory_dir / 'groups.yaml', 'w') as f:
-        yaml.dump(groups, f, default_flow_style=False)
+    with open(INVENTORY_DIR / 'groups.yaml', 'w') as f:
+        safe_dump(groups, f)
         
-    with open(inventory_dir / 'defaults.yaml', 'w') as f:
-        yaml.dump(defaults, f, default_flow_style=False)
+    with open(INVENTORY_DIR / 'defaults.yaml', 'w') as f:
+        safe_dump(defaults, f)
+    
+    # Written last so an interrupted run regenerates next time
+    INVENTORY_STAMP.write_text(digest)
     
     return len(hostnames)
 
@@ -67,26 +143,33 @@ def main():
     parser = argparse.ArgumentParser(description='NXOS Port Profile Checker')
     parser.add_argument('--detailed', action='store_true', 
                        help='Include detailed interface listing in CSV output')
+    parser.add_argument('--workers', type=positive_int, default=None,
+                       help='Number of devices to process in parallel '
+                            f'(default: number of hosts, up to {MAX_DEFAULT_WORKERS})')
+    parser.add_argument('--connect-rate', type=non_negative_float, default=0,
+                       help='Maximum new SSH connections per second (default: unlimited)')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Print the full Nornir result for every device')
     args = parser.parse_args()
     
+    prefetcher = None
+    
     try:
-        # Prompt for credentials
         print("NXOS Port Profile Checker")
         print("-" * 30)
-        username = input("Username: ")
-        password = getpass.getpass("Password: ")
-        
-        if not username or not password:
-            logger.error("Username and password are required")
-            return
         
         # Create inventory files from text file
         num_hosts = create_inventory_files_from_txt('src/inventory/hostnames.txt')
         logger.info(f"Created inventory for {num_hosts} hosts")
         
+        num_workers = args.workers
+        if num_workers is None:
+            num_workers = max(1, min(MAX_DEFAULT_WORKERS, num_hosts))
+        logger.info(f"Using {num_workers} workers")
+        
         # Initialize Nornir
         nr = InitNornir(
-            runner={"plugin": "threaded", "options": {"num_workers": 5}},
+            runner={"plugin": "threaded", "options": {"num_workers": num_workers}},
             inventory={
                 "plugin": "SimpleInventory",
                 "options": {
@@ -100,16 +183,34 @@ def main():
         
         logger.info(f"Initialized Nornir with {len(nr.inventory.hosts)} devices")
         
-        # Set credentials for all devices
-        for host in nr.inventory.hosts.values():
-            host.username = username
-            host.password = password
+        # Resolve device addresses while waiting for the user to enter credentials
+        prefetcher = AddressPrefetcher(nr.inventory.hosts.values())
+        
+        # Prompt for credentials
+        username = input("Username: ")
+        password = getpass.getpass("Password: ")
+        
+        if not username or not password:
+            logger.error("Username and password are required")
+            return
+        
+        prefetcher.apply()
+        
+        # Set credentials once on the defaults, inherited by all devices
+        nr.inventory.defaults.username = username
+        nr.inventory.defaults.password = password
         
         # Execute the task to check active port profiles
         logger.info("Starting port profile collection...")
         print("Collecting port profile data from devices...")
         
-        results = nr.run(task=check_port_profiles)
+        results = nr.run(
+            task=check_port_profiles,
+            connect_throttle=ConnectThrottle(args.connect_rate)
+        )
+        
+        if args.verbose:
+            print_result(results)
         
         # Process results and generate CSV
         summary = process_results(results)
@@ -128,6 +229,9 @@ def main():
         logger.error(f"Unexpected error: {str(e)}")
         print(f"\n❌ Error: {str(e)}")
         raise
+    finally:
+        if prefetcher:
+            prefetcher.cancel()
 
 def process_results(results):
     """Process Nornir results into summary format"""
@@ -141,12 +245,7 @@ def process_results(results):
         if result.failed:
             failed_hosts += 1
             error_msg = str(result.exception) if result.exception else "Unknown error"
-            summary.append({
-                "host": host, 
-                "status": "Failed", 
-                "error": error_msg,
-                "port_profiles": None
-            })
+            summary.append(HostResult(host, "Failed", error_msg, None))
             print(f"❌ {host}: Failed - {error_msg}")
             logger.error(f"Failed to collect data from {host}: {error_msg}")
         else:
@@ -159,11 +258,8 @@ def process_results(results):
             host_unused = 0
             
             if port_profiles:
-                for key, profile_data in port_profiles.items():
-                    if key.startswith('UNUSED_'):
-                        host_unused += 1
-                    else:
-                        host_applied += 1
+                host_applied = len(port_profiles['applied'])
+                host_unused = len(port_profiles['unused'])
                 host_profiles = host_applied + host_unused
             
             total_profiles += host_profiles
@@ -172,12 +268,7 @@ def process_results(results):
             # Show concise host summary
             print(f"✅ {host}: {host_profiles} profiles ({host_applied} applied, {host_unused} unused)")
             
-            summary.append({
-                "host": host, 
-                "status": "Success", 
-                "port_profiles": port_profiles,
-                "error": None
-            })
+            summary.append(HostResult(host, "Success", None, port_profiles))
     
     # Print overall summary
     print(f"\n📈 Summary:")
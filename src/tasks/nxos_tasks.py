@@ -1,46 +1,125 @@
-from nornir_netmiko.tasks import netmiko_send_command
 import logging
+import multiprocessing
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from utils.conn_pool import pool
 
 logger = logging.getLogger(__name__)
 
-def check_port_profiles(task):
+USAGE_COMMAND = "show port-profile usage"
+ALL_PROFILES_COMMAND = "show port-profile"
+OUTPUT_DELIMITER = "===SPLIT==="
+
+# Both show commands chained into a single prompt round-trip
+COMBINED_COMMAND = f"{USAGE_COMMAND} ; echo {OUTPUT_DELIMITER} ; {ALL_PROFILES_COMMAND}"
+_DELIMITER_RE = re.compile(rf'^\s*{OUTPUT_DELIMITER}\s*$', re.M)
+
+# Profile header lines and the indented Ethernet interfaces listed beneath them
+_PROFILE_RE = re.compile(r'^[ \t]*port-profile[ \t]*(.*?)[ \t\r]*$', re.M)
+_IFACE_RE = re.compile(r'^ [ \t]*(.*Ethernet.*?)[ \t\r]*$', re.M)
+
+# Outputs larger than this (in characters) are parsed in a worker process so
+# CPU-bound parsing does not hold the GIL shared with the SSH worker threads
+PARSE_OFFLOAD_THRESHOLD = 256 * 1024
+
+_parse_executor = None
+_parse_executor_lock = threading.Lock()
+
+def check_port_profiles(task, connect_throttle=None):
     """
     Check all port profiles on NXOS devices (both applied and unused)
     
+    Args:
+        connect_throttle (ConnectThrottle): Optional limiter applied before the
+            SSH connection is opened
+    
     Returns:
         dict: Dictionary containing all port profile information
     """
     try:
-        # Get port profile usage information
-        usage_result = task.run(
-            task=netmiko_send_command,
-            command_string="show port-profile usage"
-        )
+        # Reuse a pooled SSH session from an earlier run when one is available
+        pool.attach(task.host)
+        if connect_throttle and 'netmiko' not in task.host.connections:
+            connect_throttle.wait()
         
-        # Get all port profiles (including unused ones)
-        all_profiles_result = task.run(
-            task=netmiko_send_command,
-            command_string="show port-profile"
-        )
+        conn = task.host.get_connection('netmiko', task.nornir.config)
+        
+        # Get port profile usage and all port profiles (including unused ones)
+        usage_output, all_profiles_output = send_port_profile_commands(conn)
         
         # Log to file only, not console
-        logger.debug(f"Port profile usage output from {task.host}:\n{usage_result.result}")
-        logger.debug(f"All port profiles output from {task.host}:\n{all_profiles_result.result}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Port profile usage output from %s:\n%s", task.host, usage_output)
+            logger.debug("All port profiles output from %s:\n%s", task.host, all_profiles_output)
         
-        # Parse both outputs
-        applied_profiles = parse_port_profile_usage_output(usage_result.result)
-        all_profiles = parse_all_port_profiles_output(all_profiles_result.result)
+        pool.release(task.host)
         
-        # Combine the results
-        combined_profiles = combine_profile_data(applied_profiles, all_profiles)
+        # Parse and combine both outputs
+        if len(usage_output) + len(all_profiles_output) > PARSE_OFFLOAD_THRESHOLD:
+            future = _get_parse_executor().submit(
+                parse_port_profile_outputs, usage_output, all_profiles_output
+            )
+            return future.result()
         
-        return combined_profiles
+        return parse_port_profile_outputs(usage_output, all_profiles_output)
         
     except Exception as e:
         logger.error(f"Error checking port profiles on {task.host}: {str(e)}")
+        # The session may be mid-command or broken, so close it rather than reuse it
+        pool.discard(task.host)
         raise
 
+def send_port_profile_commands(conn):
+    """
+    Run both port profile show commands over one netmiko session round-trip
+    
+    Falls back to two separate commands if the device does not return the
+    delimiter (e.g. command chaining is not supported).
+    
+    Returns:
+        tuple: ('show port-profile usage' output, 'show port-profile' output)
+    """
+    output = conn.send_command(COMBINED_COMMAND)
+    parts = _DELIMITER_RE.split(output, maxsplit=1)
+    
+    if len(parts) == 2:
+        return parts[0], parts[1]
+    
+    logger.debug("Chained command output missing delimiter, sending commands separately")
+    return conn.send_command(USAGE_COMMAND), conn.send_command(ALL_PROFILES_COMMAND)
+
+def _iter_profile_blocks(output):
+    """Yield (profile name, start, end) offsets of the body under each profile header"""
+    matches = list(_PROFILE_RE.finditer(output))
+    
+    for i, match in enumerate(matches):
+        if not match.group(1):
+            continue
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(output)
+        yield match.group(1), match.end(), end
+
+def _get_parse_executor():
+    """Create the shared parsing process pool on first use"""
+    global _parse_executor
+    
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            # spawn avoids forking a process that is running SSH worker threads
+            _parse_executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _parse_executor
+
+def parse_port_profile_outputs(usage_output, all_profiles_output):
+    """Parse both show outputs and combine them into one profile dictionary"""
+    applied_profiles = parse_port_profile_usage_output(usage_output)
+    all_profiles = parse_all_port_profiles_output(all_profiles_output)
+    
+    return combine_profile_data(applied_profiles, all_profiles)
+
 def parse_port_profile_usage_output(output):
     """Parse the 'show port-profile usage' command output"""
     applied_profiles = {}
@@ -48,22 +127,15 @@ def parse_port_profile_usage_output(output):
     if not output:
         return applied_profiles
     
-    lines = output.split('\n')
-    current_profile = None
-    
-    for line in lines:
-        if line.strip().startswith('port-profile'):
-            current_profile = line.strip().replace('port-profile', '').strip()
-            
-        elif line.startswith(' ') and 'Ethernet' in line:
-            interface = line.strip()
-            if current_profile and interface:
-                applied_profiles[interface] = {
-                    'profile': current_profile,
-                    'vlan': 'N/A',
-                    'description': f'Applied via port-profile {current_profile}',
-                    'status': 'Applied'
-                }
+    for current_profile, start, end in _iter_profile_blocks(output):
+        # Interfaces sit between this profile header and the next one
+        for interface in _IFACE_RE.findall(output, start, end):
+            applied_profiles[interface] = {
+                'profile': current_profile,
+                'vlan': 'N/A',
+                'description': f'Applied via port-profile {current_profile}',
+                'status': 'Applied'
+            }
     
     return applied_profiles
 
@@ -74,77 +146,35 @@ def parse_all_port_profiles_output(output):
     if not output:
         return all_profiles
     
-    lines = output.split('\n')
-    current_profile = None
-    profile_config = []
-    
-    for line in lines:
-        if line.strip().startswith('port-profile'):
-            # Save previous profile if exists
-            if current_profile:
-                all_profiles[current_profile] = {
-                    'profile': current_profile,
-                    'config': '\n'.join(profile_config),
-                    'status': 'Defined'
-                }
-            
-            # Start new profile
-            current_profile = line.strip().replace('port-profile', '').strip()
-            profile_config = []
-            
-        elif current_profile and line.strip():
-            profile_config.append(line.strip())
-    
-    # Save last profile
-    if current_profile:
+    for current_profile, start, end in _iter_profile_blocks(output):
         all_profiles[current_profile] = {
             'profile': current_profile,
-            'config': '\n'.join(profile_config),
+            'config': output[start:end].strip('\r\n'),
             'status': 'Defined'
         }
     
     return all_profiles
 
 def combine_profile_data(applied_profiles, all_profiles):
-    """Combine applied and all profiles data"""
-    combined = {}
+    """
+    Combine applied and all profiles data
     
-    # Add all applied profiles (interface-based)
-    for interface, profile_data in applied_profiles.items():
-        combined[interface] = profile_data
+    Returns:
+        dict: 'applied' maps interface -> profile data, 'unused' maps
+            profile name -> profile data for profiles with no interfaces
+    """
+    # Profiles applied to at least one interface
+    applied_names = {data['profile'] for data in applied_profiles.values()}
     
-    # Add unused profiles (profile-based)
-    for profile_name, profile_data in all_profiles.items():
-        # Check if this profile is applied to any interface
-        is_applied = any(data['profile'] == profile_name for data in applied_profiles.values())
-        
-        if not is_applied:
-            combined[f"UNUSED_{profile_name}"] = {
+    # Collect unused profiles (profile-based)
+    unused_profiles = {}
+    for profile_name in all_profiles:
+        if profile_name not in applied_names:
+            unused_profiles[profile_name] = {
                 'profile': profile_name,
                 'vlan': 'N/A',
                 'description': f'Port-profile {profile_name} defined but not applied',
                 'status': 'Unused'
             }
     
-    return combined
-
-def summarize_port_profiles(nr):
-    summary = []
-    for host in nr.inventory.hosts.values():
-        summary.append({
-            "Host": host.name,
-            "Port Profiles": host.get("port_profiles", "N/A")
-        })
-    return summary
-
-def main():
-    nr = InitNornir(config_file="src/config/nornir_config.yaml")
-    results = nr.run(task=check_port_profiles)
-    print_result(results)
-
-    summary = summarize_port_profiles(nr)
-    df = pd.DataFrame(summary)
-    df.to_csv("output/port_profiles_summary.csv", index=False)
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+    return {'applied': applied_profiles, 'unused': unused_profiles}
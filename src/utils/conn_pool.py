@@ -0,0 +1,133 @@
+import atexit
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CONNECTION_POOL_IDLE_TIMEOUT = 300
+CONNECTION_POOL_MAX_AGE = 3600
+CONNECTION_POOL_REAP_INTERVAL = 60
+
+def connection_key(host):
+    """Build the pool key for a Nornir host"""
+    return (host.hostname, host.port, host.username, host.platform)
+
+class ConnectionPool:
+    """
+    Keep Nornir connection plugins alive between runs in the same process
+
+    Connections are checked out while a task uses them and checked back in
+    afterwards. A background thread closes connections that have been idle
+    longer than idle_timeout or were opened more than max_age seconds ago.
+    """
+
+    def __init__(self, connection='netmiko',
+                 idle_timeout=CONNECTION_POOL_IDLE_TIMEOUT,
+                 max_age=CONNECTION_POOL_MAX_AGE,
+                 reap_interval=CONNECTION_POOL_REAP_INTERVAL):
+        self.connection = connection
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.reap_interval = reap_interval
+        self._entries = {}
+        self._checked_out = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    def attach(self, host):
+        """Hand a pooled connection (if any) to the host before it connects"""
+        key = connection_key(host)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            self._checked_out.pop(key, None)
+
+        if entry is None:
+            return
+
+        plugin, created, last_used = entry
+        if self._expired(created, last_used, time.monotonic()) or not self._is_alive(plugin):
+            self._close(key, plugin)
+            return
+
+        with self._lock:
+            self._checked_out[key] = (plugin, created)
+        host.connections[self.connection] = plugin
+        logger.debug(f"Reusing pooled connection for {host}")
+
+    def release(self, host):
+        """Move the host's open connection into the pool"""
+        plugin = host.connections.pop(self.connection, None)
+        if plugin is None:
+            return
+
+        key = connection_key(host)
+        now = time.monotonic()
+        with self._lock:
+            # Keep the original creation time only if this is the connection we handed out
+            checked_out = self._checked_out.pop(key, None)
+            created = checked_out[1] if checked_out and checked_out[0] is plugin else now
+            self._entries[key] = (plugin, created, now)
+            self._start_reaper()
+
+    def discard(self, host):
+        """Close the host's connection instead of pooling it (e.g. after a failure)"""
+        plugin = host.connections.pop(self.connection, None)
+        if plugin is None:
+            return
+
+        key = connection_key(host)
+        with self._lock:
+            self._checked_out.pop(key, None)
+        self._close(key, plugin)
+
+    def close_all(self):
+        """Close every pooled connection"""
+        with self._lock:
+            entries = self._entries
+            self._entries = {}
+            self._checked_out = {}
+
+        for key, entry in entries.items():
+            self._close(key, entry[0])
+
+    def _expired(self, created, last_used, now):
+        return now - last_used > self.idle_timeout or now - created > self.max_age
+
+    def _is_alive(self, plugin):
+        try:
+            return plugin.connection.is_alive()
+        except Exception:
+            return False
+
+    def _close(self, key, plugin):
+        try:
+            plugin.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection {key}: {str(e)}")
+
+    def _start_reaper(self):
+        if self._reaper is None or not self._reaper.is_alive():
+            self._reaper = threading.Thread(target=self._reap, daemon=True)
+            self._reaper.start()
+
+    def _reap(self):
+        while True:
+            time.sleep(self.reap_interval)
+            now = time.monotonic()
+            with self._lock:
+                expired = {
+                    key: entry for key, entry in self._entries.items()
+                    if self._expired(entry[1], entry[2], now)
+                }
+                for key in expired:
+                    del self._entries[key]
+
+            for key, entry in expired.items():
+                logger.debug(f"Closing expired pooled connection {key}")
+                self._close(key, entry[0])
+
+pool = ConnectionPool()
+
+# Pooled sessions are no longer on any host, so nr.close_connections() cannot reach them
+atexit.register(pool.close_all)
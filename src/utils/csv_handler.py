@@ -1,16 +1,37 @@
-import pandas as pd
+import csv
 from datetime import datetime
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_FIELDNAMES = [
+    'Host',
+    'Status',
+    'Port_Profile',
+    'Profile_Status',
+    'Interface_Count',
+    'Sample_Interfaces',
+    'Error'
+]
+
+DETAILED_FIELDNAMES = [
+    'Host',
+    'Status',
+    'Interface',
+    'Port_Profile',
+    'Profile_Status',
+    'VLAN',
+    'Description',
+    'Error'
+]
+
 def write_to_csv(summary_data, output_dir="output", detailed=False):
     """
     Write port profile summary to CSV file
     
     Args:
-        summary_data (list): List of dictionaries containing host results
+        summary_data (list): List of HostResult objects
         output_dir (str): Output directory path
         detailed (bool): If True, include all interface details
     
@@ -24,6 +45,24 @@ def write_to_csv(summary_data, output_dir="output", detailed=False):
 
 def write_summary_csv(summary_data, output_dir):
     """Write profile-focused summary CSV"""
+    return _write_csv(
+        _iter_rows(summary_data, detailed=False),
+        SUMMARY_FIELDNAMES,
+        output_dir,
+        "port_profiles_summary"
+    )
+
+def write_detailed_csv(summary_data, output_dir):
+    """Write interface-level detailed CSV"""
+    return _write_csv(
+        _iter_rows(summary_data, detailed=True),
+        DETAILED_FIELDNAMES,
+        output_dir,
+        "port_profiles_detailed"
+    )
+
+def _write_csv(rows, fieldnames, output_dir, file_prefix):
+    """Stream rows into a timestamped CSV file"""
     try:
         # Ensure output directory exists
         output_path = Path(output_dir)
@@ -31,90 +70,132 @@ def write_summary_csv(summary_data, output_dir):
         
         # Generate timestamp for filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        csv_filename = f"port_profiles_summary_{timestamp}.csv"
+        csv_filename = f"{file_prefix}_{timestamp}.csv"
         csv_filepath = output_path / csv_filename
         
-        # Create profile-focused summary
-        csv_data = []
+        # Save to CSV, counting rows as they are written
+        row_count = 0
         
-        for entry in summary_data:
-            host = entry.get('host', 'Unknown')
-            status = entry.get('status', 'Unknown')
-            error = entry.get('error', '')
-            port_profiles = entry.get('port_profiles', {})
-            
-            if status == "Success" and port_profiles:
-                # Group interfaces by profile
-                profile_summary = {}
-                
-                for key, profile_info in port_profiles.items():
-                    profile_name = profile_info.get('profile', 'N/A')
-                    
-                    if key.startswith('UNUSED_'):
-                        # Unused profile
-                        profile_summary[profile_name] = {
-                            'status': 'Unused',
-                            'interface_count': 0,
-                            'interfaces': 'None'
-                        }
-                    else:
-                        # Applied profile
-                        if profile_name not in profile_summary:
-                            profile_summary[profile_name] = {
-                                'status': 'Applied',
-                                'interface_count': 0,
-                                'interfaces': []
-                            }
-                        profile_summary[profile_name]['interface_count'] += 1
-                        profile_summary[profile_name]['interfaces'].append(key)
-                
-                # Create CSV rows for each profile
-                for profile_name, profile_data in profile_summary.items():
-                    if profile_data['status'] == 'Applied':
-                        # Format interface list (first few interfaces + count)
-                        interfaces = profile_data['interfaces']
-                        if len(interfaces) <= 3:
-                            interface_list = ', '.join(interfaces)
-                        else:
-                            interface_list = f"{', '.join(interfaces[:3])} ... (+{len(interfaces)-3} more)"
-                    else:
-                        interface_list = 'None'
-                    
-                    csv_data.append({
-                        'Host': host,
-                        'Status': status,
-                        'Port_Profile': profile_name,
-                        'Profile_Status': profile_data['status'],
-                        'Interface_Count': profile_data['interface_count'],
-                        'Sample_Interfaces': interface_list,
-                        'Error': ''
-                    })
-            else:
-                # Failed connection or no data
-                csv_data.append({
-                    'Host': host,
-                    'Status': status,
-                    'Port_Profile': 'N/A',
-                    'Profile_Status': 'N/A',
-                    'Interface_Count': 0,
-                    'Sample_Interfaces': 'N/A',
-                    'Error': error
-                })
+        def counted(rows):
+            nonlocal row_count
+            for row in rows:
+                row_count += 1
+                yield row
         
-        # Create DataFrame and save to CSV
-        df = pd.DataFrame(csv_data)
-        df.to_csv(csv_filepath, index=False)
+        with open(csv_filepath, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(counted(rows))
         
         logger.info(f"CSV report saved to: {csv_filepath}")
-        logger.info(f"Total rows: {len(csv_data)}")
+        logger.info(f"Total rows: {row_count}")
         
         return str(csv_filepath)
-        
+    
     except Exception as e:
         logger.error(f"Error writing CSV file: {str(e)}")
         raise
 
-def write_detailed_csv(summary_data, output_dir):
-    """Write interface-level detailed CSV"""
-    # Placeholder for detailed CSV writing logic
-    pass
\ No newline at end of file
+def _iter_rows(summary_data, detailed):
+    """Yield CSV rows for each host, either per profile or per interface"""
+    for entry in summary_data:
+        host = entry.host
+        status = entry.status
+        error = entry.error
+        port_profiles = entry.port_profiles
+        
+        if status == "Success" and port_profiles and any(port_profiles.values()):
+            if detailed:
+                yield from _iter_interface_rows(host, status, port_profiles)
+            else:
+                yield from _iter_profile_rows(host, status, port_profiles)
+        elif detailed:
+            # Failed connection or no data
+            yield {
+                'Host': host,
+                'Status': status,
+                'Interface': 'N/A',
+                'Port_Profile': 'N/A',
+                'Profile_Status': 'N/A',
+                'VLAN': 'N/A',
+                'Description': 'N/A',
+                'Error': error
+            }
+        else:
+            # Failed connection or no data
+            yield {
+                'Host': host,
+                'Status': status,
+                'Port_Profile': 'N/A',
+                'Profile_Status': 'N/A',
+                'Interface_Count': 0,
+                'Sample_Interfaces': 'N/A',
+                'Error': error
+            }
+
+def _iter_interface_rows(host, status, port_profiles):
+    """Yield one row per interface, then one row per unused profile"""
+    for interface, profile_info in port_profiles['applied'].items():
+        yield _interface_row(host, status, interface, profile_info)
+    
+    for profile_info in port_profiles['unused'].values():
+        yield _interface_row(host, status, 'None', profile_info)
+
+def _interface_row(host, status, interface, profile_info):
+    """Build a detailed CSV row"""
+    return {
+        'Host': host,
+        'Status': status,
+        'Interface': interface,
+        'Port_Profile': profile_info.get('profile', 'N/A'),
+        'Profile_Status': profile_info.get('status', 'N/A'),
+        'VLAN': profile_info.get('vlan', 'N/A'),
+        'Description': profile_info.get('description', ''),
+        'Error': ''
+    }
+
+def _iter_profile_rows(host, status, port_profiles):
+    """Yield one row per profile with its interface count and a sample of interfaces"""
+    # Group applied interfaces by profile
+    profile_summary = {}
+    
+    for interface, profile_info in port_profiles['applied'].items():
+        profile_name = profile_info.get('profile', 'N/A')
+        if profile_name not in profile_summary:
+            profile_summary[profile_name] = {
+                'status': 'Applied',
+                'interface_count': 0,
+                'interfaces': []
+            }
+        profile_summary[profile_name]['interface_count'] += 1
+        profile_summary[profile_name]['interfaces'].append(interface)
+    
+    # Unused profiles have no interfaces
+    for profile_name in port_profiles['unused']:
+        profile_summary[profile_name] = {
+            'status': 'Unused',
+            'interface_count': 0,
+            'interfaces': 'None'
+        }
+    
+    # Create CSV rows for each profile
+    for profile_name, profile_data in profile_summary.items():
+        if profile_data['status'] == 'Applied':
+            # Format interface list (first few interfaces + count)
+            interfaces = profile_data['interfaces']
+            if len(interfaces) <= 3:
+                interface_list = ', '.join(interfaces)
+            else:
+                interface_list = f"{', '.join(interfaces[:3])} ... (+{len(interfaces)-3} more)"
+        else:
+            interface_list = 'None'
+        
+        yield {
+            'Host': host,
+            'Status': status,
+            'Port_Profile': profile_name,
+            'Profile_Status': profile_data['status'],
+            'Interface_Count': profile_data['interface_count'],
+            'Sample_Interfaces': interface_list,
+            'Error': ''
+        }
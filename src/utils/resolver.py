@@ -0,0 +1,53 @@
+import logging
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+MAX_RESOLVER_WORKERS = 32
+
+def resolve_addresses(hostname, port=22):
+    """Return the unique addresses for hostname in resolver order (empty if unresolvable)"""
+    try:
+        results = socket.getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+    except (OSError, UnicodeError) as e:
+        # UnicodeError covers malformed names such as empty or over-long labels
+        logger.debug(f"Could not resolve {hostname}: {str(e)}")
+        return []
+    return list(dict.fromkeys(result[4][0] for result in results))
+
+class AddressPrefetcher:
+    """
+    Resolve Nornir host addresses in the background
+
+    Lookups start as soon as the prefetcher is created so they can overlap
+    with other work (e.g. prompting for credentials). apply() waits for them
+    and points each host that resolves to a single address at that address,
+    so the SSH connect does not resolve it again. Hosts with several
+    addresses (or none) are left unchanged for the SSH client to handle.
+    Those lookups gain nothing unless the system resolver caches them.
+    """
+
+    def __init__(self, hosts, max_workers=MAX_RESOLVER_WORKERS):
+        hosts = list(hosts)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(hosts))))
+        self._lookups = [
+            (host, self._executor.submit(resolve_addresses, host.hostname, host.port or 22))
+            for host in hosts
+        ]
+
+    def apply(self):
+        """Wait for all lookups and pin single-address hosts to their address"""
+        resolved = 0
+        for host, future in self._lookups:
+            addresses = future.result()
+            if len(addresses) == 1 and addresses[0] != host.hostname:
+                host.hostname = addresses[0]
+                resolved += 1
+
+        self._executor.shutdown()
+        logger.info(f"Pre-resolved addresses for {resolved} hosts")
+
+    def cancel(self):
+        """Drop any lookups that have not started yet"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class HostResult:
+    """Outcome of the port profile collection for a single host"""
+    host: str
+    status: str
+    error: str | None = None
+    port_profiles: dict | None = None
@@ -0,0 +1,29 @@
+import threading
+import time
+
+class ConnectThrottle:
+    """
+    Limit how quickly new device connections are opened across worker threads
+
+    Args:
+        rate (float): Maximum connections started per second (0 disables throttling)
+    """
+
+    def __init__(self, rate=0):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Block until the caller is allowed to open a connection"""
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,16 @@
+import yaml
+
+# Prefer the libyaml C bindings when available
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+def safe_load(stream):
+    """Load YAML from a string or file object"""
+    return yaml.load(stream, Loader=SafeLoader)
+
+def safe_dump(data, stream=None, **kwargs):
+    """Dump data as YAML to a file object (or return it as a string)"""
+    kwargs.setdefault('default_flow_style', False)
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)